@@ -3,8 +3,15 @@ Environment configuration handling for Linear-GitHub issue matching scripts.
 Loads environment variables from .env file without polluting os.environ.
 """
 
+from __future__ import annotations
+
+import logging
 import os
-from typing import Optional, NamedTuple
+import re
+from typing import Dict, Optional, NamedTuple, Tuple, Union
+
+
+log = logging.getLogger(__name__)
 
 
 class ApiTokens(NamedTuple):
@@ -13,76 +20,122 @@ class ApiTokens(NamedTuple):
     github_token: Optional[str]
 
 
-def load_env_file(env_path: Optional[str] = None) -> ApiTokens:
+# Default .env location: next to this module
+_DEFAULT_ENV_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '.env'))
+
+# Parsed .env results keyed by (absolute path, mtime in ns, size), so repeated
+# calls only cost an os.stat() until the file actually changes
+_ENV_CACHE: Dict[Tuple[str, int, int], ApiTokens] = {}
+
+# One KEY=value assignment per line; the value may be double-quoted, single-quoted
+# or bare (a bare value ends at an inline "# comment")
+_ENV_LINE_RE = re.compile(
+    r"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"""
+    r"""(?:"([^"\n]*)"|'([^'\n]*)'|([^\n#]*?))[ \t\r]*(?:#[^\n]*)?$""",
+    re.MULTILINE,
+)
+
+# .env keys we care about, mapped to their ApiTokens field
+_ENV_KEYS = {
+    'LINEAR_API_TOKEN': 'linear_token',
+    'GITHUB_TOKEN': 'github_token',
+}
+
+
+def _report(message: str, level: int, verbose: bool) -> None:
+    """Print message when verbose, otherwise route it through the module logger"""
+    if verbose:
+        print(message)
+    else:
+        log.log(level, message)
+
+
+def load_env_file(env_path: Optional[str] = None, verbose: bool = False) -> ApiTokens:
     """Load environment variables from .env file and return as named tuple.
     
     Args:
         env_path: Optional path to .env file. If not provided, looks for .env in script directory.
+        verbose: Print progress messages to stdout instead of logging them at DEBUG level
         
     Returns:
         ApiTokens named tuple with linear_token and github_token fields
     """
     if env_path is None:
-        env_path = os.path.join(os.path.dirname(__file__), '.env')
+        env_path = _DEFAULT_ENV_PATH
+    else:
+        env_path = os.path.abspath(env_path)
+    try:
+        st = os.stat(env_path)
+        cache_key = (env_path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        cache_key = None
+    
+    if cache_key is not None and cache_key in _ENV_CACHE:
+        return _ENV_CACHE[cache_key]
     
-    linear_token = None
-    github_token = None
+    values = dict.fromkeys(_ENV_KEYS.values())
     
-    if os.path.exists(env_path):
-        print(f"Loading environment variables from {env_path}")
+    if cache_key is not None:
+        _report(f"Loading environment variables from {env_path}", logging.DEBUG, verbose)
         with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    # Remove quotes if present
-                    value = value.strip().strip('"').strip("'")
-                    
-                    if key == 'LINEAR_API_TOKEN':
-                        linear_token = value
-                    elif key == 'GITHUB_TOKEN':
-                        github_token = value
+            text = f.read()
+        
+        for match in _ENV_LINE_RE.finditer(text):
+            field = _ENV_KEYS.get(match.group(1))
+            if field is not None:
+                double_quoted, single_quoted, bare = match.group(2, 3, 4)
+                if double_quoted is not None:
+                    values[field] = double_quoted
+                elif single_quoted is not None:
+                    values[field] = single_quoted
+                else:
+                    values[field] = bare
+                
+                # Stop scanning once every token we care about has been found
+                if None not in values.values():
+                    break
         
-        print("Environment variables loaded successfully")
+        _report("Environment variables loaded successfully", logging.DEBUG, verbose)
     else:
-        print(f"Warning: .env file not found at {env_path}")
-        print("You can create a .env file with your API tokens:")
-        print("LINEAR_API_TOKEN=your_linear_token_here")
-        print("GITHUB_TOKEN=your_github_token_here")
+        _report(f"Warning: .env file not found at {env_path}\n"
+                "You can create a .env file with your API tokens:\n"
+                "LINEAR_API_TOKEN=your_linear_token_here\n"
+                "GITHUB_TOKEN=your_github_token_here", logging.WARNING, verbose)
     
-    return ApiTokens(linear_token=linear_token, github_token=github_token)
+    tokens = ApiTokens(**values)
+    if cache_key is not None:
+        _ENV_CACHE[cache_key] = tokens
+    return tokens
 
 
-def check_tokens_tuple(tokens: ApiTokens) -> bool:
+def check_tokens(tokens_or_linear_token: Union[ApiTokens, Optional[str]], github_token: Optional[str] = None,
+                 verbose: bool = False) -> bool:
     """Check if required tokens are present and provide helpful messages.
     
     Args:
-        tokens: ApiTokens named tuple
-        
-    Returns:
-        True if all required tokens are present, False otherwise
-    """
-    return check_tokens(tokens.linear_token, tokens.github_token)
-
-
-def check_tokens(linear_token: Optional[str], github_token: Optional[str]) -> bool:
-    """Check if required tokens are present and provide helpful messages.
-    
-    Args:
-        linear_token: Linear API token
+        tokens_or_linear_token: ApiTokens named tuple, or the Linear API token itself
         github_token: GitHub token (not checked here - warning is lazy)
+        verbose: Print messages to stdout instead of logging them
         
     Returns:
         True if all required tokens are present, False otherwise
     """
+    if isinstance(tokens_or_linear_token, ApiTokens):
+        linear_token = tokens_or_linear_token.linear_token
+    else:
+        linear_token = tokens_or_linear_token
+    
     if not linear_token:
-        print("Error: LINEAR_API_TOKEN is required")
-        print("Add it to your .env file or get your token from: https://linear.app/settings/api")
-        print("Example .env file:")
-        print("LINEAR_API_TOKEN=your_linear_token_here")
+        _report("Error: LINEAR_API_TOKEN is required\n"
+                "Add it to your .env file or get your token from: https://linear.app/settings/api\n"
+                "Example .env file:\n"
+                "LINEAR_API_TOKEN=your_linear_token_here", logging.ERROR, verbose)
         return False
     
     # GitHub token warning removed - will be shown lazily only if REST API is used
     
-    return True
\ No newline at end of file
+    return True
+
+
+# Older name, from when check_tokens only accepted the individual tokens
+check_tokens_tuple = check_tokens
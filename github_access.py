@@ -3,18 +3,93 @@ GitHub API access classes for Linear-GitHub issue matching.
 Contains both REST API and CLI-based implementations.
 """
 
+from __future__ import annotations
+
 import json
 import os
 import time
 import subprocess
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 import requests
+from github_cache import GitHubIssueCache
+from http_session import get_session
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+# Maximum number of gh CLI processes run at once for a batch when there is no token
+CLI_MAX_WORKERS = 8
+
+# Maximum number of issues requested per GitHub GraphQL call, kept well under
+# GitHub's per-query node limit
+GRAPHQL_BATCH_SIZE = 75
+
+# Largest value of GraphQL's Int type; a larger literal fails validation of the whole query
+_GRAPHQL_MAX_INT = 2 ** 31 - 1
+
+# Result status for a GraphQL alias that came back null, by its error type
+_GRAPHQL_ERROR_STATUS = {"NOT_FOUND": 'not_found', "RATE_LIMITED": 'rate_limited'}
+
+# GitHub issue URL: captures "owner/repo" and the issue number
+_GH_ISSUE_RE = re.compile(r"github\.com/([A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+)/issues/(\d+)\b")
+
+# First path segments of github.com URLs that are site pages rather than repository owners
+GITHUB_NON_OWNER_PATHS = frozenset({"orgs", "settings", "marketplace", "blog", "features"})
+
+# GitHub CLI/GraphQL report OPEN/CLOSED (and MERGED for pull requests); normalize
+# to the REST API's open/closed, which reports merged pull requests as closed
+_GH_STATE_MAP = {"OPEN": "open", "CLOSED": "closed", "MERGED": "closed",
+                 "open": "open", "closed": "closed", "": ""}
+
+
+# Below this many remaining requests, wait for the rate limit window to reset
+# before sending the next request instead of running into a 403
+_RATE_LIMIT_LOW_WATER = 5
+
+
+def _rate_limit_wait(response: requests.Response, fallback: float) -> float:
+    """Seconds to wait before retrying a rate-limited response
+    Uses Retry-After (secondary limits) or X-RateLimit-Reset (primary limit) when
+    GitHub sends them, otherwise the given fallback backoff
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return max(1, int(retry_after))
+    reset = response.headers.get("X-RateLimit-Reset")
+    if reset and reset.isdigit() and response.headers.get("X-RateLimit-Remaining") == "0":
+        return max(1, int(reset) - int(time.time()))
+    return fallback
+
+
+def _rate_limit_reset_if_low(response: requests.Response) -> Optional[int]:
+    """Return the X-RateLimit-Reset time if the remaining budget is nearly used up"""
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    if remaining and reset and remaining.isdigit() and reset.isdigit() \
+            and int(remaining) < _RATE_LIMIT_LOW_WATER:
+        return int(reset)
+    return None
+
+
+def _sleep_until(reset: Optional[int]) -> None:
+    """Sleep until the given epoch time, if it is in the future"""
+    if reset:
+        wait_time = reset - time.time()
+        if wait_time > 0:
+            time.sleep(wait_time)
 
 
 class GitHubAPIRest:
     """GitHub API access using REST API calls (original version, kept for history)"""
     
+    __slots__ = ("token", "base_url", "headers", "_token_warning_shown", "session", "_rate_limit_reset")
+    
     def __init__(self, token: str = None):
         self.token = token
         self.base_url = "https://api.github.com"
@@ -25,6 +100,13 @@ class GitHubAPIRest:
         # Track if we've shown the token warning
         self._token_warning_shown = False
 
+        # Process-wide keep-alive session shared by all worker threads; connection errors,
+        # 429 and 5xx responses are retried by urllib3, so only 403 is handled below
+        self.session = get_session()
+
+        # Reset time of the rate limit window once the remaining budget runs low
+        self._rate_limit_reset = None
+
         # Note: Rate limiting is now handled by ThreadPoolExecutor max_workers
     
     def _show_token_warning_once(self):
@@ -42,47 +124,194 @@ class GitHubAPIRest:
         # Show token warning on first use
         self._show_token_warning_once()
         
+        url = f"{self.base_url}/repos/{repo}/issues/{issue_number}"
+        data, status = self._request(url, max_retries)
+        if status != 'success':
+            return None, status
+
+        return {
+            "id": data.get("id"),
+            "number": data.get("number"),
+            "title": data.get("title"),
+            "state": data.get("state"),
+            "html_url": data.get("html_url")
+        }, 'success'
+
+    def _request(self, url: str, max_retries: int = 2) -> tuple[Optional[dict], str]:
+        """GET a REST API URL, waiting out rate limits
+        Returns: (json_data, status) where status is 'success', 'not_found', 'rate_limited',
+        or 'error'; json_data is only set on success
+        """
         for attempt in range(max_retries):
-            url = f"{self.base_url}/repos/{repo}/issues/{issue_number}"
             try:
-                response = requests.get(url, headers=self.headers)
+                _sleep_until(self._rate_limit_reset)
+                response = self.session.get(url, headers=self.headers)
+                self._rate_limit_reset = _rate_limit_reset_if_low(response)
                 if response.status_code == 404:
                     return None, 'not_found'
                 elif response.status_code == 403:
                     # Rate limited - wait and retry
                     if attempt < max_retries - 1:
-                        wait_time = (attempt + 1) * 5  # 5, 10 seconds
+                        wait_time = _rate_limit_wait(response, (attempt + 1) * 5)  # default 5, 10 seconds
                         time.sleep(wait_time)
                         continue
                     else:
                         return None, 'rate_limited'
                 response.raise_for_status()
-                data = response.json()
-                return {
-                    "id": data.get("id"),
-                    "number": data.get("number"),
-                    "title": data.get("title"),
-                    "state": data.get("state"),
-                    "html_url": data.get("html_url")
-                }, 'success'
-            except requests.RequestException as e:
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    continue
-                else:
-                    return None, 'error'
+                return _loads(response.content), 'success'
+            except (requests.RequestException, ValueError):
+                # Transport-level retries already happened in the session adapter
+                return None, 'error'
 
         return None, 'error'
 
-
 class GitHubAPI:
-    """GitHub API access using GitHub CLI tool (gh command) - current version"""
+    """GitHub API access using GitHub CLI tool (gh command) - current version
     
-    def __init__(self, token: str = None):
-        # Token parameter kept for compatibility, but gh CLI uses its own auth
+    When a token is available, issues are fetched in batches through the GraphQL API
+    instead of spawning one gh process per issue. Neither path supports conditional
+    requests, so an optional cache is only used for entries younger than cache_ttl.
+    """
+    
+    def __init__(self, token: str = None, cache: Optional[GitHubIssueCache] = None, cache_ttl: int = 0):
+        # Without a token the gh CLI is used, which has its own auth
         self.token = token
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.graphql_url = "https://api.github.com/graphql"
+        self.headers = {}
+        self.session = None
+        # Environment for gh subprocesses, built once: GITHUB_TOKEN is removed because
+        # it interferes with gh CLI's own auth mechanism
+        self._child_env = {k: v for k, v in os.environ.items() if k != 'GITHUB_TOKEN'}
+        # Final results already fetched during this run, so the same issue is never
+        # requested twice however callers group their lookups
+        self._results: dict[tuple[str, int], tuple[Optional[dict], str]] = {}
+        # Reset time of the rate limit window once the remaining budget runs low
+        self._rate_limit_reset = None
+        if token:
+            self.headers = {"Authorization": f"bearer {token}"}
+            self.session = get_session()
 
     def get_issue_details(self, repo: str, issue_number: int, max_retries: int = 2) -> tuple[Optional[dict], str]:
+        """Get details of a GitHub issue (thin wrapper over get_issue_details_batch)
+        Returns: (issue_details, status) where status is 'success', 'not_found', 'rate_limited', or 'error'
+        """
+        return self.get_issue_details_batch([(repo, issue_number)], max_retries)[(repo, issue_number)]
+
+    def get_issue_details_batch(self, repo_issue_pairs: list[tuple[str, int]],
+                                max_retries: int = 2) -> dict[tuple[str, int], tuple[Optional[dict], str]]:
+        """Get details of many GitHub issues, GRAPHQL_BATCH_SIZE issues per request
+        Returns: dict mapping (repo, issue_number) to (issue_details, status), see get_issue_details
+        """
+        pairs = list(dict.fromkeys(repo_issue_pairs))
+        results = {pair: self._results[pair] for pair in pairs if pair in self._results}
+        pairs = [pair for pair in pairs if pair not in results]
+        if self.cache:
+            for pair in pairs:
+                cached = self.cache.get_fresh(*pair, self.cache_ttl)
+                if cached:
+                    results[pair] = cached.details, 'success'
+            pairs = [pair for pair in pairs if pair not in results]
+
+        fetched = {}
+        if not self.token:
+            if len(pairs) > 1:
+                # One gh process per issue; run a few at a time since each one waits on the network
+                with ThreadPoolExecutor(max_workers=min(CLI_MAX_WORKERS, len(pairs))) as executor:
+                    details = executor.map(lambda pair: self._get_issue_details_cli(*pair, max_retries), pairs)
+                    fetched = dict(zip(pairs, details))
+            else:
+                fetched = {pair: self._get_issue_details_cli(*pair, max_retries) for pair in pairs}
+        else:
+            # No issue has a number beyond GraphQL's Int range, and querying one would
+            # fail validation of its whole batch
+            fetched = {pair: (None, 'not_found') for pair in pairs if pair[1] > _GRAPHQL_MAX_INT}
+            pairs = [pair for pair in pairs if pair not in fetched]
+            for start in range(0, len(pairs), GRAPHQL_BATCH_SIZE):
+                fetched.update(self._get_issue_details_graphql(pairs[start:start + GRAPHQL_BATCH_SIZE], max_retries))
+
+        for pair, result in fetched.items():
+            # Rate limits and errors are transient, so only final answers are remembered
+            if result[1] in ('success', 'not_found'):
+                self._results[pair] = result
+        if self.cache:
+            for (repo, number), (details, status) in fetched.items():
+                if status == 'success':
+                    self.cache.put(repo, number, details)
+        results.update(fetched)
+        return results
+
+    def _get_issue_details_graphql(self, pairs: list[tuple[str, int]],
+                                   max_retries: int) -> dict[tuple[str, int], tuple[Optional[dict], str]]:
+        """Fetch one batch of issues with a single aliased GraphQL query"""
+        fields = []
+        for i, (repo, issue_number) in enumerate(pairs):
+            owner, _, name = repo.partition("/")
+            # issueOrPullRequest: an /issues/N link may point at a pull request, which
+            # GitHub redirects to on the web and the REST issues endpoint also returns
+            fields.append(f"i{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                          f"{{ issueOrPullRequest(number: {int(issue_number)}) {{ "
+                          f"... on Issue {{ id number title state url }} "
+                          f"... on PullRequest {{ id number title state url }} }} }}")
+        query = "query {\n" + "\n".join(fields) + "\n}"
+
+        for attempt in range(max_retries):
+            try:
+                _sleep_until(self._rate_limit_reset)
+                response = self.session.post(self.graphql_url, json={"query": query}, headers=self.headers)
+                self._rate_limit_reset = _rate_limit_reset_if_low(response)
+                if response.status_code in (403, 429):
+                    # Rate limited - wait and retry
+                    if attempt < max_retries - 1:
+                        wait_time = _rate_limit_wait(response, (attempt + 1) * 10)  # default 10, 20 seconds
+                        time.sleep(wait_time)
+                        continue
+                    return dict.fromkeys(pairs, (None, 'rate_limited'))
+                response.raise_for_status()
+                body = _loads(response.content)
+            except (requests.RequestException, ValueError):
+                return dict.fromkeys(pairs, (None, 'error'))
+
+            data = body.get("data")
+            if data is None:
+                errors = body.get("errors") or []
+                if any(error.get("type") == "RATE_LIMITED" for error in errors):
+                    if attempt < max_retries - 1:
+                        time.sleep(_rate_limit_wait(response, (attempt + 1) * 10))
+                        continue
+                    return dict.fromkeys(pairs, (None, 'rate_limited'))
+                return dict.fromkeys(pairs, (None, 'error'))
+
+            # Failed aliases come back as null with an error whose path starts at the alias;
+            # only NOT_FOUND means the issue does not exist (others are e.g. FORBIDDEN for SSO)
+            alias_errors = {}
+            for error in body.get("errors") or []:
+                path = error.get("path") or []
+                if path:
+                    alias_errors.setdefault(path[0], error.get("type") or "")
+
+            results = {}
+            for i, pair in enumerate(pairs):
+                repository = data.get(f"i{i}")
+                issue = repository.get("issueOrPullRequest") if repository else None
+                if issue:
+                    raw_state = issue.get("state") or ""
+                    results[pair] = {
+                        "id": issue.get("id"),
+                        "number": issue.get("number"),
+                        "title": issue.get("title"),
+                        "state": _GH_STATE_MAP.get(raw_state) or raw_state.lower(),
+                        "html_url": issue.get("url")
+                    }, 'success'
+                else:
+                    error_type = alias_errors.get(f"i{i}", "NOT_FOUND")
+                    results[pair] = None, _GRAPHQL_ERROR_STATUS.get(error_type, 'error')
+            return results
+
+        return dict.fromkeys(pairs, (None, 'error'))
+
+    def _get_issue_details_cli(self, repo: str, issue_number: int, max_retries: int = 2) -> tuple[Optional[dict], str]:
         """Get details of a GitHub issue using GitHub CLI
         Returns: (issue_details, status) where status is 'success', 'not_found', 'rate_limited', or 'error'
         """
@@ -92,18 +321,15 @@ class GitHubAPI:
                 cmd = ["gh", "issue", "view", str(issue_number), "--repo", repo, "--json", 
                        "number,title,state,url,id"]
                 
-                # Pass environment but remove GITHUB_TOKEN as it interferes with gh CLI's own auth
-                env = os.environ.copy()
-                # Remove GITHUB_TOKEN if present - gh CLI uses its own auth mechanism
-                env.pop('GITHUB_TOKEN', None)
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, env=env)
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, env=self._child_env)
                 
                 if result.returncode == 0:
                     # Success - parse JSON response
                     try:
-                        data = json.loads(result.stdout)
+                        data = _loads(result.stdout)
                         # Convert GitHub CLI state format to match REST API
-                        state = data.get("state", "").lower()  # OPEN -> open, CLOSED -> closed
+                        raw_state = data.get("state", "")
+                        state = _GH_STATE_MAP.get(raw_state) or raw_state.lower()  # OPEN -> open, CLOSED -> closed
                         
                         return {
                             "id": data.get("id"),
@@ -156,24 +382,23 @@ class GitHubAPI:
 
 def extract_first_attachment_github_link(issue_data: dict) -> Optional[Tuple[str, int, str]]:
     """Extract only the first GitHub issue from attachments (for mirrored issues)
+    Called once per Linear issue by query_all_issues.py, so it stops at the first match
+    and only looks at attachment URLs (attachment metadata is never fetched or decoded)
     Returns: (repo, issue_number, source) tuple or None if no GitHub link found
     """
-    github_patterns = [
-        r"github\.com/([^/]+/[^/]+)/issues/(\d+)",
-    ]
-
     # Only check attachments, and only return the first GitHub link found
     attachments = issue_data.get("attachments", {}).get("nodes", [])
     
     for attachment in attachments:
         url = attachment.get("url", "")
+        # Cheap substring test first: most attachments (Slack, Figma, ...) are not GitHub links
+        if "github.com/" not in url:
+            continue
         
-        for pattern in github_patterns:
-            match = re.search(pattern, url)
-            if match and len(match.groups()) == 2:
-                repo, number = match.groups()
-                # Return immediately after finding the first GitHub issue in attachments
-                return (repo, int(number), url)
+        match = _GH_ISSUE_RE.search(url)
+        if match and match.group(1).partition("/")[0] not in GITHUB_NON_OWNER_PATHS:
+            # Return immediately after finding the first GitHub issue in attachments
+            return (match.group(1), int(match.group(2)), url)
     
     # No GitHub link found in attachments
-    return None
\ No newline at end of file
+    return None
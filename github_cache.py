@@ -0,0 +1,113 @@
+"""
+Persistent cache of GitHub issue details for Linear-GitHub issue matching scripts.
+Stores issue details in a small SQLite database so repeated runs can skip
+GitHub lookups for issues fetched recently.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+
+# Default cache location: next to this module, like the .env file
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '.github_cache.sqlite')
+
+# Entries not refreshed for this long are dropped when the cache is opened
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+
+
+class CacheEntry(NamedTuple):
+    """Cached GitHub issue details and when they were fetched."""
+    details: dict
+    fetched_at: int
+
+    def is_fresh(self, ttl: int) -> bool:
+        """Whether the entry is younger than ttl seconds"""
+        return time.time() - self.fetched_at < ttl
+
+
+class GitHubIssueCache:
+    """SQLite-backed cache of GitHub issue details keyed by (repo, issue_number).
+
+    Safe to share between worker threads: all database access is serialized by a lock.
+    get_fresh() lookups count as hits when fresh and as misses otherwise, for stats().
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_age: Optional[int] = DEFAULT_MAX_AGE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    repo TEXT,
+                    number INT,
+                    json BLOB,
+                    fetched_at INT,
+                    PRIMARY KEY (repo, number)
+                )
+            """)
+        if max_age is not None:
+            self.evict_older_than(max_age)
+
+    def get(self, repo: str, issue_number: int) -> Optional[CacheEntry]:
+        """Return the cached entry for an issue, or None if it was never stored"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT json, fetched_at FROM cache WHERE repo = ? AND number = ?",
+                (repo, issue_number)).fetchone()
+        if row is None:
+            return None
+        payload, fetched_at = row
+        return CacheEntry(json.loads(payload), fetched_at)
+
+    def get_fresh(self, repo: str, issue_number: int, ttl: int) -> Optional[CacheEntry]:
+        """Return the cached entry if it is fresh (see CacheEntry.is_fresh)"""
+        entry = self.get(repo, issue_number)
+        # A stale entry is fetched from GitHub again, so it counts as a miss
+        fresh = entry is not None and entry.is_fresh(ttl)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry if fresh else None
+
+    def put(self, repo: str, issue_number: int, details: dict) -> None:
+        """Store (or replace) the details of an issue"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (repo, number, json, fetched_at) VALUES (?, ?, ?, ?)",
+                (repo, issue_number, json.dumps(details), int(time.time())))
+
+    def clear(self) -> None:
+        """Delete all cached entries"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def stats(self) -> dict:
+        """Return the number of stored entries and the get_fresh() hits and misses so far"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+    def evict_older_than(self, max_age: int) -> int:
+        """Delete entries fetched more than max_age seconds ago
+        Returns: number of deleted entries
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM cache WHERE fetched_at < ?",
+                                        (int(time.time()) - max_age,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
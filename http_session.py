@@ -0,0 +1,51 @@
+"""
+Shared HTTP session for the Linear and GitHub API clients.
+All clients and worker threads in a process reuse one pooled keep-alive session,
+so connections to api.linear.app and api.github.com are opened only once.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use.
+    
+    The session carries no auth headers: clients pass their own headers per request,
+    so one session can be shared by clients with different tokens.
+    Connection errors, 429 and 5xx responses are retried by urllib3 with exponential
+    backoff (honoring Retry-After); once retries run out the last response is returned
+    so callers can still inspect its status code.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=frozenset({"GET", "POST"}), raise_on_status=False)
+                session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry))
+                _SESSION = session
+    return _SESSION
+
+
+def close_session() -> None:
+    """Close the process-wide session and its pooled connections.
+    
+    A later get_session() call creates a fresh session.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
@@ -3,14 +3,172 @@ Linear API access module for Linear-GitHub issue matching scripts.
 Provides a unified interface for accessing Linear's GraphQL API.
 """
 
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import requests
-from typing import List, Dict, Optional, Tuple
+from http_session import get_session
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# Issue field sets shared by all issue queries. "minimal" is everything the status
+# matching reads; "full" adds the description and attachment titles, which are
+# scanned for GitHub links by query_one_issue.py. The status matching only looks
+# for the first GitHub link among the attachments (the mirrored issue, attached when
+# the issue is synced), so "minimal" only fetches the first few.
+_ISSUE_FIELDS_MINIMAL = """
+fragment IssueFields on Issue {
+    id
+    identifier
+    title
+    state {
+        name
+    }
+    attachments(first: 10) {
+        nodes {
+            url
+        }
+    }
+}
+"""
+
+_ISSUE_FIELDS_FULL = """
+fragment IssueFields on Issue {
+    id
+    identifier
+    title
+    description
+    state {
+        name
+    }
+    attachments {
+        nodes {
+            url
+            title
+        }
+    }
+}
+"""
+
+_ISSUE_FIELDS = {
+    "minimal": _ISSUE_FIELDS_MINIMAL,
+    "full": _ISSUE_FIELDS_FULL,
+}
+
+_ISSUE_BY_ID_QUERY = """
+query GetIssue($issueId: String!) {
+    issue(id: $issueId) {
+        ...IssueFields
+    }
+}
+"""
+
+_ISSUES_BY_IDENTIFIER_QUERY = """
+query GetIssues($filter: IssueFilter!, $first: Int!) {
+    issues(filter: $filter, first: $first) {
+        nodes {
+            ...IssueFields
+        }
+    }
+}
+"""
+
+# pageInfo comes before nodes, so a streamed response reveals the next cursor
+# before its issues and the next page can be requested while they are parsed
+_TEAM_ISSUES_QUERY = """
+query GetTeamIssues($teamId: String!, $cursor: String, $pageSize: Int!) {
+    team(id: $teamId) {
+        issues(first: $pageSize, after: $cursor) {
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+            nodes {
+                ...IssueFields
+            }
+        }
+    }
+}
+"""
+
+# Largest page Linear returns for a single connection query
+_MAX_PAGE_SIZE = 250
+
+# ijson prefixes of the team issues response
+_TEAM_ISSUE_NODE_PREFIX = "data.team.issues.nodes.item"
+_TEAM_HAS_NEXT_PAGE_PREFIX = "data.team.issues.pageInfo.hasNextPage"
+_TEAM_END_CURSOR_PREFIX = "data.team.issues.pageInfo.endCursor"
+_TEAM_PAGE_INFO_PREFIX = "data.team.issues.pageInfo"
+_TEAM_PREFIX = "data.team"
+_ERROR_MESSAGE_PREFIX = "errors.item.message"
+
+# Complete query documents (operation + fragment) per field set, built once at import
+_ISSUE_BY_ID_QUERIES = {name: _ISSUE_BY_ID_QUERY + fragment for name, fragment in _ISSUE_FIELDS.items()}
+_ISSUES_BY_IDENTIFIER_QUERIES = {name: _ISSUES_BY_IDENTIFIER_QUERY + fragment for name, fragment in _ISSUE_FIELDS.items()}
+_TEAM_ISSUES_QUERIES = {name: _TEAM_ISSUES_QUERY + fragment for name, fragment in _ISSUE_FIELDS.items()}
+
+# On-disk cache of team lookups, so reruns of the scripts skip resolving the team
+DEFAULT_TEAM_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "linear_github_checker", "teams.json")
+_TEAM_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# JSON request bodies up to (excluding) the closing brace, keyed by query text, so a
+# query document is only encoded once however many pages or batches are requested
+_QUERY_BODY_PREFIXES: Dict[str, bytes] = {}
+
+
+def _encode_request(query: str, variables: Optional[dict]) -> bytes:
+    """Encode a GraphQL request body, reusing the pre-encoded query part"""
+    prefix = _QUERY_BODY_PREFIXES.get(query)
+    if prefix is None:
+        prefix = _QUERY_BODY_PREFIXES.setdefault(query, _dumps({"query": query})[:-1])
+    return prefix + b',"variables":' + _dumps(variables or {}) + b"}"
+
+
+def _select_query(queries: Dict[str, str], fields: str) -> str:
+    """Return the query document for the requested issue field set"""
+    try:
+        return queries[fields]
+    except KeyError:
+        raise ValueError(f"Unknown issue field set: {fields!r} (expected one of {sorted(queries)})") from None
+
+
+def _raise_for_graphql_errors(messages: List[str]) -> None:
+    """Raise if a GraphQL response reported errors"""
+    if messages:
+        raise ValueError(f"Linear API error: {'; '.join(messages)}")
+
+
+def _close_page_response(future: Future) -> None:
+    """Close the response of a page request that completed but will not be read"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
 
 
 class LinearAPI:
     """Unified Linear API access class"""
     
-    def __init__(self, api_token: str):
+    __slots__ = ("api_token", "base_url", "headers", "session", "team_cache_path", "_all_teams", "_team_cache")
+    
+    def __init__(self, api_token: str, team_cache_path: Optional[str] = DEFAULT_TEAM_CACHE_PATH):
         self.api_token = api_token
         self.base_url = "https://api.linear.app/graphql"
         self.headers = {
@@ -18,15 +176,32 @@ class LinearAPI:
             "Content-Type": "application/json"
         }
 
+        # Process-wide keep-alive session; headers are passed per request
+        self.session = get_session()
+
+        # Per-instance caches for team lookups, backed by an on-disk cache shared
+        # between runs (None disables it)
+        self.team_cache_path = team_cache_path
+        self._all_teams: Optional[List[Dict]] = None
+        self._team_cache: Dict[str, Optional[Dict]] = {}
+
     def query(self, query: str, variables: dict = None) -> dict:
         """Execute a GraphQL query against Linear API"""
-        payload = {"query": query, "variables": variables or {}}
-        response = requests.post(self.base_url, json=payload, headers=self.headers)
+        response = self.session.post(self.base_url, data=_encode_request(query, variables), headers=self.headers)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
 
     def get_all_teams(self) -> List[Dict]:
-        """Get all teams with their details"""
+        """Get all teams with their details (fetched once per instance)"""
+        if self._all_teams is None:
+            self._all_teams = self._read_team_cache("teams")
+            if self._all_teams is None:
+                self._all_teams = self._fetch_all_teams()
+                self._write_team_cache("teams", self._all_teams)
+        return self._all_teams
+
+    def _fetch_all_teams(self) -> List[Dict]:
+        """Query Linear for all teams"""
         query = """
         query {
             teams {
@@ -44,12 +219,64 @@ class LinearAPI:
     def get_team_by_identifier(self, identifier: str) -> Optional[Dict]:
         """Get a team by its key (acronym) or name.
         
+        Lookups are cached per instance, and teams that were found are also cached on
+        disk for a day, since teams rarely change.
+        
         Args:
             identifier: Team key (e.g., 'MOCO', 'MOTO') or name (e.g., 'MojoCompiler')
             
         Returns:
             Team dict with id, name, and key, or None if not found
         """
+        if identifier not in self._team_cache:
+            team = self._read_team_cache(f"team:{identifier}")
+            if team is None:
+                team = self._lookup_team_by_identifier(identifier)
+                if team is not None:
+                    self._write_team_cache(f"team:{identifier}", team)
+            self._team_cache[identifier] = team
+        return self._team_cache[identifier]
+
+    def _team_cache_key(self) -> str:
+        """Key of this token's entries in the team cache (the token itself is never stored)"""
+        return hashlib.sha256(self.api_token.encode()).hexdigest()[:16]
+
+    def _load_team_cache_file(self) -> dict:
+        """Read the whole team cache file, or an empty dict if missing or unreadable"""
+        try:
+            with open(self.team_cache_path, "rb") as f:
+                data = _loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _read_team_cache(self, key: str):
+        """Return a cached team lookup result younger than a day, or None"""
+        if not self.team_cache_path:
+            return None
+        entry = self._load_team_cache_file().get(self._team_cache_key(), {}).get(key)
+        if entry and time.time() - entry.get("fetched_at", 0) < _TEAM_CACHE_TTL:
+            return entry.get("value")
+        return None
+
+    def _write_team_cache(self, key: str, value) -> None:
+        """Store a team lookup result; failures only cost a lookup on the next run"""
+        if not self.team_cache_path:
+            return
+        data = self._load_team_cache_file()
+        data.setdefault(self._team_cache_key(), {})[key] = {"fetched_at": int(time.time()), "value": value}
+        try:
+            os.makedirs(os.path.dirname(self.team_cache_path), exist_ok=True)
+            # Write to a temporary file first so concurrent runs never read a partial file
+            tmp_path = f"{self.team_cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_dumps(data))
+            os.replace(tmp_path, self.team_cache_path)
+        except OSError:
+            pass
+
+    def _lookup_team_by_identifier(self, identifier: str) -> Optional[Dict]:
+        """Resolve a team key or name with up to three Linear queries (uncached)"""
         # Try to find by key first (case-insensitive)
         identifier_upper = identifier.upper()
         query = """
@@ -100,173 +327,82 @@ class LinearAPI:
             return team["id"]
         raise ValueError("MojoCompiler team not found")
 
-    def get_issue_by_id(self, issue_id: str) -> Optional[dict]:
-        """Get a single issue by its Linear ID"""
-        query = """
-        query GetIssue($issueId: String!) {
-            issue(id: $issueId) {
-                id
-                identifier
-                title
-                description
-                state {
-                    name
-                }
-                team {
-                    name
-                    key
-                }
-                attachments {
-                    nodes {
-                        id
-                        title
-                        url
-                        subtitle
-                        metadata
-                    }
-                }
-                createdAt
-                updatedAt
-                assignee {
-                    name
-                    email
-                }
-                creator {
-                    name
-                    email
-                }
-                labels {
-                    nodes {
-                        name
-                        color
-                    }
-                }
-            }
-        }
+    def get_issue_by_id(self, issue_id: str, fields: str = "minimal") -> Optional[dict]:
+        """Get a single issue by its Linear ID
+        
+        Args:
+            issue_id: Linear issue ID
+            fields: Issue field set to request, "minimal" or "full"
         """
         variables = {"issueId": issue_id}
-        result = self.query(query, variables)
+        result = self.query(_select_query(_ISSUE_BY_ID_QUERIES, fields), variables)
         return result["data"]["issue"] if result["data"]["issue"] else None
 
-    def get_issue_by_identifier(self, identifier: str) -> Optional[dict]:
-        """Get a single issue by its identifier (e.g., MOCO-1233)"""
-        query = """
-        query GetIssues($filter: IssueFilter!) {
-            issues(filter: $filter) {
-                nodes {
-                    id
-                    identifier
-                    title
-                    description
-                    state {
-                        name
-                    }
-                    team {
-                        name
-                        key
-                    }
-                    attachments {
-                        nodes {
-                            id
-                            title
-                            url
-                            subtitle
-                            metadata
-                        }
-                    }
-                    createdAt
-                    updatedAt
-                    assignee {
-                        name
-                        email
-                    }
-                    creator {
-                        name
-                        email
-                    }
-                    labels {
-                        nodes {
-                            name
-                            color
-                        }
-                    }
-                }
-            }
-        }
+    def get_issue_by_identifier(self, identifier: str, fields: str = "minimal") -> Optional[dict]:
+        """Get a single issue by its identifier (e.g., MOCO-1233)
+        
+        Args:
+            identifier: Linear issue identifier
+            fields: Issue field set to request, "minimal" or "full"
         """
-        variables = {
-            "filter": {
-                "number": {
-                    "eq": int(identifier.split("-")[1])
-                },
-                "team": {
-                    "key": {
-                        "eq": identifier.split("-")[0]
-                    }
+        return self.get_issues_by_identifiers([identifier], fields).get(identifier)
+
+    def get_issues_by_identifiers(self, identifiers: List[str], fields: str = "minimal") -> Dict[str, dict]:
+        """Get many issues by identifier with one query per team key
+        
+        Args:
+            identifiers: Linear issue identifiers (e.g., ['MOCO-1233', 'MOTO-456'])
+            fields: Issue field set to request, "minimal" or "full"
+            
+        Returns:
+            Dict mapping each identifier that was found to its issue
+        """
+        query = _select_query(_ISSUES_BY_IDENTIFIER_QUERIES, fields)
+
+        # Group requested issue numbers by team key, remembering the caller's spelling
+        numbers_by_team: Dict[str, Dict[int, str]] = {}
+        for identifier in identifiers:
+            team_key, _, number = identifier.partition("-")
+            try:
+                numbers_by_team.setdefault(team_key, {})[int(number)] = identifier
+            except ValueError:
+                raise ValueError(f"Invalid issue identifier: {identifier!r} (expected e.g. MOCO-1233)") from None
+
+        found = {}
+        for team_key, wanted in numbers_by_team.items():
+            numbers = list(wanted)
+            for start in range(0, len(numbers), _MAX_PAGE_SIZE):
+                chunk = numbers[start:start + _MAX_PAGE_SIZE]
+                variables = {
+                    "filter": {
+                        "number": {
+                            "in": chunk
+                        },
+                        "team": {
+                            "key": {
+                                "eq": team_key
+                            }
+                        }
+                    },
+                    "first": len(chunk)
                 }
-            }
-        }
-        result = self.query(query, variables)
-        issues = result["data"]["issues"]["nodes"]
-        return issues[0] if issues else None
+                result = self.query(query, variables)
+                for issue in result["data"]["issues"]["nodes"]:
+                    number = int(issue["identifier"].partition("-")[2])
+                    if number in wanted:
+                        found[wanted[number]] = issue
+        return found
 
-    def get_all_team_issues(self, team_id: str, cursor: str = None, page_size: int = 200) -> Tuple[List[dict], Optional[str]]:
+    def get_all_team_issues(self, team_id: str, cursor: str = None, page_size: int = 200,
+                            fields: str = "minimal") -> Tuple[List[dict], Optional[str]]:
         """Get all issues for a team with pagination"""
-        query = f"""
-        query GetTeamIssues($teamId: String!, $cursor: String) {{
-            team(id: $teamId) {{
-                issues(first: {page_size}, after: $cursor) {{
-                    nodes {{
-                        id
-                        identifier
-                        title
-                        description
-                        state {{
-                            name
-                        }}
-                        team {{
-                            name
-                            key
-                        }}
-                        attachments {{
-                            nodes {{
-                                id
-                                title
-                                url
-                                subtitle
-                                metadata
-                            }}
-                        }}
-                        createdAt
-                        updatedAt
-                        assignee {{
-                            name
-                            email
-                        }}
-                        creator {{
-                            name
-                            email
-                        }}
-                        labels {{
-                            nodes {{
-                                name
-                                color
-                            }}
-                        }}
-                    }}
-                    pageInfo {{
-                        hasNextPage
-                        endCursor
-                    }}
-                }}
-            }}
-        }}
-        """
-        variables = {"teamId": team_id}
+        query = _select_query(_TEAM_ISSUES_QUERIES, fields)
+        variables = {"teamId": team_id, "pageSize": page_size}
         if cursor:
             variables["cursor"] = cursor
 
         result = self.query(query, variables)
+        _raise_for_graphql_errors([error.get("message", "") for error in result.get("errors") or []])
         team_data = result["data"]["team"]
 
         if not team_data:
@@ -276,4 +412,106 @@ class LinearAPI:
         issues = issues_data["nodes"]
         next_cursor = issues_data["pageInfo"]["endCursor"] if issues_data["pageInfo"]["hasNextPage"] else None
 
-        return issues, next_cursor
\ No newline at end of file
+        return issues, next_cursor
+
+    def iter_all_team_issues(self, team_id: str, page_size: int = 200) -> Iterator[dict]:
+        """Iterate over all issues of a team, prefetching the next page in the background
+        
+        The request for page N+1 is already in flight while the caller consumes page N,
+        so Linear's response latency is hidden behind the caller's own work.
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(self.get_all_team_issues, team_id, None, page_size)
+            while future is not None:
+                issues, cursor = future.result()
+                future = executor.submit(self.get_all_team_issues, team_id, cursor, page_size) if cursor else None
+                yield from issues
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_team_issues_streaming(self, team_id: str, page_size: int = 200) -> Iterator[dict]:
+        """Iterate over all issues of a team, parsing each page as it streams in
+        
+        Issues are yielded as soon as they are parsed, so a page is never held in memory
+        as a whole. Each response lists pageInfo before its issues, so the request for
+        the next page is already in flight while the current one is being consumed.
+        Falls back to iter_all_team_issues if ijson is not installed.
+        """
+        if ijson is None:
+            yield from self.iter_all_team_issues(team_id, page_size)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self._open_team_issues_page, team_id, None, page_size)
+        next_future = None
+
+        def prefetch(page_info: dict) -> None:
+            nonlocal next_future
+            if page_info.get("hasNextPage") and page_info.get("endCursor"):
+                next_future = executor.submit(self._open_team_issues_page, team_id,
+                                              page_info["endCursor"], page_size)
+
+        try:
+            while future is not None:
+                yield from self._stream_team_issues_page(future.result(), prefetch)
+                future, next_future = next_future, None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            # Pages that will not be read (early exit or error): release their connections
+            for pending in (future, next_future):
+                if pending is not None:
+                    pending.add_done_callback(_close_page_response)
+
+    def _open_team_issues_page(self, team_id: str, cursor: Optional[str], page_size: int) -> requests.Response:
+        """Send the request for one page of team issues, leaving the body to be streamed"""
+        variables = {"teamId": team_id, "pageSize": page_size}
+        if cursor:
+            variables["cursor"] = cursor
+        body = _encode_request(_TEAM_ISSUES_QUERIES["minimal"], variables)
+
+        response = self.session.post(self.base_url, data=body, headers=self.headers, stream=True)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        response.raw.decode_content = True
+        return response
+
+    def _stream_team_issues_page(self, response: requests.Response,
+                                 on_page_info: Callable[[dict], None]) -> Iterator[dict]:
+        """Stream the issues of one page, passing its pageInfo to on_page_info once parsed
+        
+        Raises ValueError, like get_all_team_issues, if the response reports errors or
+        lacks the page info, so a failing page cannot silently end the pagination.
+        """
+        page_info = {}
+        with response:
+            builder = None
+            team_seen = False
+            error_messages = []
+            for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                if builder is not None:
+                    # Inside an issue node: feed events until the node's own end_map
+                    builder.event(event, value)
+                    if prefix == _TEAM_ISSUE_NODE_PREFIX and event == "end_map":
+                        yield builder.value
+                        builder = None
+                elif prefix == _TEAM_ISSUE_NODE_PREFIX and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == _TEAM_HAS_NEXT_PAGE_PREFIX:
+                    page_info["hasNextPage"] = value
+                elif prefix == _TEAM_END_CURSOR_PREFIX:
+                    page_info["endCursor"] = value
+                elif prefix == _TEAM_PAGE_INFO_PREFIX and event == "end_map":
+                    on_page_info(page_info)
+                elif prefix == _TEAM_PREFIX and event == "start_map":
+                    team_seen = True
+                elif prefix == _ERROR_MESSAGE_PREFIX:
+                    error_messages.append(value)
+
+        _raise_for_graphql_errors(error_messages)
+        if team_seen and "hasNextPage" not in page_info:
+            raise ValueError("Linear API error: team issues response has no pageInfo")
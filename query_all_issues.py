@@ -11,10 +11,12 @@ import argparse
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from urllib.parse import urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from github_access import GitHubAPI, extract_first_attachment_github_link
-from env_config import load_env_file, check_tokens_tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from github_access import GRAPHQL_BATCH_SIZE, GitHubAPI, extract_first_attachment_github_link
+from env_config import load_env_file, check_tokens
+from github_cache import GitHubIssueCache
 from linear_access import LinearAPI
+from http_session import close_session
 
 @dataclass
 class Issue:
@@ -28,23 +30,40 @@ class Issue:
     github_state: Optional[str]
 
 
-def process_github_link(github_api: 'GitHubAPI', linear_id: str, linear_status: str, linear_title: str,
-                       repo: str, issue_number: int, source: str) -> tuple[Optional[tuple], str]:
-    """Process a single GitHub link and return table row data if successful
-    Returns: (table_row_data, status) where status is 'success', 'not_found', 'rate_limited', or 'error'
+def process_github_link(github_details: Optional[dict], status: str, linear_id: str, linear_status: str,
+                        linear_title: str, repo: str, show_all: bool = True) -> tuple[Optional[tuple], str]:
+    """Turn the fetched details of a single GitHub link into table row data if successful
+    Returns: (table_row_data, status) where status is 'success', 'filtered', 'not_found', 'rate_limited',
+    or 'error'; 'filtered' means a matching status pair that is hidden unless show_all is set
     """
-    github_details, status = github_api.get_issue_details(repo, issue_number)
-
     if status == 'success' and github_details and github_details.get('number'):
         gh_number = str(github_details['number'])
         gh_status = github_details['state']
         gh_title = github_details['title']
+        # GitHub states are already normalized to lowercase by github_access
+        if not show_all and (linear_status.lower(), gh_status) in FILTERED_STATUS_PAIRS:
+            return None, 'filtered'
         # Include repo information for markdown links
         table_row = (linear_id, linear_status, linear_title, gh_number, gh_status, gh_title, repo)
         return table_row, status
 
     return None, status
 
+# Minimum number of seconds between two GitHub progress lines
+PROGRESS_INTERVAL = 1.0
+
+# Linear issue identifier, e.g. "MOCO-123": captures the team key and the number
+_LINEAR_ID_RE = re.compile(r"([^-]+)-(\d+)")
+
+def linear_id_sort_key(row: tuple) -> tuple[str, int]:
+    """Sort key for table rows: Linear team key, then issue number numerically"""
+    linear_id = row[0]  # e.g., "MOCO-123"
+    match = _LINEAR_ID_RE.fullmatch(linear_id)
+    if match:
+        return (match.group(1), int(match.group(2)))
+    # Fallback for IDs that are not TEAM-NUMBER
+    return (linear_id, 0)
+
 def truncate_text(text: str, max_length: int) -> str:
     """Truncate text to max_length characters, adding ellipsis if truncated"""
     if not text:
@@ -53,20 +72,28 @@ def truncate_text(text: str, max_length: int) -> str:
         return text
     return text[:max_length-3] + "..."
 
-def print_table_header():
-    """Print the table header with proper formatting"""
-    print("+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 12 + "+" + "-" * 12 + "+" + "-" * 42 + "+" + "-" * 42 + "+")
-    print(f"| {'Linear ID':<13} | {'Status':<10} | {'GH Status':<10} | {'GH Number':<10} | {'Linear Title':<40} | {'GH Title':<40} |")
-    print("+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 12 + "+" + "-" * 12 + "+" + "-" * 42 + "+" + "-" * 42 + "+")
+# Horizontal rule used above and below the header and at the end of the table
+TABLE_SEPARATOR = "+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 12 + "+" + "-" * 12 + "+" + "-" * 42 + "+" + "-" * 42 + "+"
 
-def print_table_row(linear_id: str, linear_status: str, linear_title: str,
-                   gh_number: str, gh_status: str, gh_title: str, repo: str = ""):
-    """Print a single table row with proper formatting"""
-    print(f"| {truncate_text(linear_id, 13):<13} | {truncate_text(linear_status, 10):<10} | {truncate_text(gh_status, 10):<10} | {truncate_text(gh_number, 10):<10} | {truncate_text(linear_title, 40):<40} | {truncate_text(gh_title, 40):<40} |")
+# Cell layout shared by the header and every row. Short ID/status columns are clipped
+# by the format spec itself; only the title columns get an ellipsis (see truncate_text)
+_TABLE_ROW_FORMAT = "| {:<13.13} | {:<10.10} | {:<10.10} | {:<10.10} | {:<40} | {:<40} |"
 
-def print_table_footer():
-    """Print the table footer"""
-    print("+" + "-" * 15 + "+" + "-" * 12 + "+" + "-" * 12 + "+" + "-" * 12 + "+" + "-" * 42 + "+" + "-" * 42 + "+")
+_TABLE_HEADER = "\n".join([
+    TABLE_SEPARATOR,
+    _TABLE_ROW_FORMAT.format("Linear ID", "Status", "GH Status", "GH Number", "Linear Title", "GH Title"),
+    TABLE_SEPARATOR,
+])
+
+def format_table_header() -> str:
+    """Format the table header with proper formatting"""
+    return _TABLE_HEADER
+
+def format_table_row(linear_id: str, linear_status: str, linear_title: str,
+                     gh_number: str, gh_status: str, gh_title: str, repo: str = "") -> str:
+    """Format a single table row with proper formatting"""
+    return _TABLE_ROW_FORMAT.format(linear_id or "", linear_status or "", gh_status or "", gh_number or "",
+                                    truncate_text(linear_title, 40), truncate_text(gh_title, 40))
 
 def create_markdown_table(table_rows) -> str:
     """Create a markdown table from the table rows data"""
@@ -74,8 +101,10 @@ def create_markdown_table(table_rows) -> str:
         return "No results to display.\n"
     
     # Markdown table header
-    markdown = "| Linear Issue | Status | GH Status | GH Issue | Linear Title | GH Title |\n"
-    markdown += "|--------------|--------|-----------|----------|--------------|----------|\n"
+    lines = [
+        "| Linear Issue | Status | GH Status | GH Issue | Linear Title | GH Title |",
+        "|--------------|--------|-----------|----------|--------------|----------|",
+    ]
     
     # Process each row
     for linear_id, linear_status, linear_title, gh_number, gh_status, gh_title, repo in table_rows:
@@ -85,24 +114,22 @@ def create_markdown_table(table_rows) -> str:
         # Create GitHub link using the actual repo
         gh_link = f"[#{gh_number}](https://github.com/{repo}/issues/{gh_number})"
         
-        # Escape markdown special characters and truncate text
+        # Escape markdown special characters and truncate text, adding ellipsis if truncated
         linear_title_escaped = linear_title.replace("|", "\\|").replace("\n", " ")[:35]
-        gh_title_escaped = gh_title.replace("|", "\\|").replace("\n", " ")[:35]
-        
-        # Add ellipsis if truncated
         if len(linear_title) > 35:
             linear_title_escaped += "..."
+        gh_title_escaped = gh_title.replace("|", "\\|").replace("\n", " ")[:35]
         if len(gh_title) > 35:
             gh_title_escaped += "..."
         
-        markdown += f"| {linear_link} | {linear_status} | {gh_status} | {gh_link} | {linear_title_escaped} | {gh_title_escaped} |\n"
+        lines.append(f"| {linear_link} | {linear_status} | {gh_status} | {gh_link} | {linear_title_escaped} | {gh_title_escaped} |")
     
-    return markdown
+    return "\n".join(lines) + "\n"
 
 
 # Define filtered status pairs (Linear status, GitHub status)
 # These are considered "matching" or "expected" combinations
-FILTERED_STATUS_PAIRS = {
+FILTERED_STATUS_PAIRS = frozenset({
     ("done", "closed"),           # Completed work, properly closed
     ("backlog", "open"),          # Future work, appropriately open
     ("canceled", "closed"),       # Canceled work, properly closed
@@ -112,7 +139,7 @@ FILTERED_STATUS_PAIRS = {
     ("duplicate", "closed"),      # Duplicate issues, properly closed
     ("will not fix", "closed"),   # Won't fix issues, properly closed
     ("triage", "open"),           # Issues being triaged, appropriately still open
-}
+})
 
 def main():
     # Parse command line arguments
@@ -135,6 +162,7 @@ Examples:
   %(prog)s --stop-after 50              # Process only first 50 Linear issues (debugging)
   %(prog)s --markdown report.md         # Save results to markdown file with clickable links
   %(prog)s --show-all --markdown all.md # Save complete report to markdown
+  %(prog)s --cache-ttl 3600             # Reuse GitHub results fetched within the last hour
 
 Filtered Status Pairs (hidden by default):
   {filtered_pairs_text}
@@ -178,18 +206,26 @@ Configuration:
                             "(like 'MojoCompiler', 'Mojo Tooling'). Case-insensitive for keys. "
                             "Default: MOCO (MojoCompiler team)")
     
+    parser.add_argument("--cache-ttl",
+                       type=int,
+                       metavar="SECONDS",
+                       help="Cache GitHub issue details in .github_cache.sqlite (next to the script) and "
+                            "reuse entries fetched less than SECONDS ago instead of querying GitHub again. "
+                            "Caching is disabled unless this option is given.")
+    
     args = parser.parse_args()
 
     # Load environment variables from .env file
     tokens = load_env_file()
 
     # Check if required tokens are present
-    if not check_tokens_tuple(tokens):
+    if not check_tokens(tokens):
         return 1
 
     # Initialize APIs
     linear = LinearAPI(tokens.linear_token)
-    github = GitHubAPI(tokens.github_token)
+    cache = GitHubIssueCache() if args.cache_ttl is not None else None
+    github = GitHubAPI(tokens.github_token, cache=cache, cache_ttl=args.cache_ttl or 0)
 
     try:
         # Get team by identifier
@@ -215,76 +251,124 @@ Configuration:
         else:
             print(f"Fetching all {team_key} issues (page size: 200)...")
 
-        all_issues = []
-        cursor = None
-
-        while True:
-            issues, next_cursor = linear.get_all_team_issues(team_id, cursor)
-            all_issues.extend(issues)
-            print(f"Fetched {len(issues)} issues (total: {len(all_issues)})")
-
-            # Check if we should stop due to --stop-after limit
-            if args.stop_after and len(all_issues) >= args.stop_after:
-                all_issues = all_issues[:args.stop_after]  # Trim to exact limit
-                print(f"DEBUG MODE: Stopped after fetching {len(all_issues)} issues")
-                break
-
-            if not next_cursor:
-                break
-            cursor = next_cursor
-            time.sleep(0.25)  # Be nice to the API
-
         # Phase 1: Collect GitHub links to process (only first attachment link per Linear issue)
-        print(f"Processing {len(all_issues)} Linear issues...")
-        print("Extracting mirrored GitHub issues (first attachment link only)...")
-
-        github_tasks = []  # List of (linear_info, github_info) tuples to process
+        # Phase 2: Process GitHub links in parallel
+        # Both phases overlap: a batch of GitHub links is submitted as soon as it is full,
+        # so GitHub requests run while later Linear pages are still being fetched
+        issue_count = 0
         issues_with_gh_links = 0
 
-        for issue_data in all_issues:
-            # Only get the first GitHub link from attachments (mirrored issue)
-            github_link = extract_first_attachment_github_link(issue_data)
-
-            if github_link:
-                issues_with_gh_links += 1
-                linear_id = issue_data['identifier']
-                linear_status = issue_data['state']['name']
-                linear_title = issue_data['title']
-
-                repo, issue_number, source = github_link
-                github_tasks.append((linear_id, linear_status, linear_title, repo, issue_number, source))
-
-        print(f"Found {len(github_tasks)} mirrored GitHub issues from {issues_with_gh_links} Linear issues")
-        print("Processing GitHub API requests in parallel...")
+        # Several Linear issues may mirror the same GitHub issue: fetch each one only once
+        linear_issues_by_link = {}  # (repo, issue_number) -> [(linear_id, linear_status, linear_title), ...]
 
-        # Phase 2: Process GitHub links in parallel
         table_rows = []
         rate_limit_hits = 0
+        filtered_count = 0  # Matching status pairs hidden unless --show-all
         processed_count = 0
         error_reports = []  # Collect error reports for problematic links
 
         # Use ThreadPoolExecutor for parallel processing
-        # Limit concurrent requests to avoid overwhelming GitHub API
-        max_workers = 10 if tokens.github_token else 5  # More workers with auth token
+        # Limit concurrent requests to avoid overwhelming GitHub API; workers share the
+        # pooled keep-alive session (pool_maxsize in http_session.py must stay >= this)
+        max_workers = 20 if tokens.github_token else 5  # More workers with auth token
+
+        # With a token, each worker fetches a whole batch in one GraphQL request;
+        # the gh CLI fallback still looks issues up one at a time
+        batch_size = GRAPHQL_BATCH_SIZE if tokens.github_token else 1
+        pending_batch = []
+        future_to_batch = {}
+
+        # Keep at most two batches per worker queued or running: when GitHub falls behind,
+        # Linear paging waits instead of piling up queued work
+        max_in_flight = 2 * max_workers
+        in_flight = set()
+
+        def submit_batch(executor, batch):
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                in_flight.difference_update(done)
+            future = executor.submit(github.get_issue_details_batch, batch)
+            future_to_batch[future] = batch
+            in_flight.add(future)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_task = {
-                executor.submit(process_github_link, github, linear_id, linear_status, linear_title, repo, issue_number, source):
-                (linear_id, linear_status, linear_title, repo, issue_number, source)
-                for linear_id, linear_status, linear_title, repo, issue_number, source in github_tasks
-            }
-
-            # Process completed requests
-            for future in as_completed(future_to_task):
-                processed_count += 1
-                linear_id, linear_status, linear_title, repo, issue_number, source = future_to_task[future]
-
+            # Issues are parsed as each page streams in and only their mirrored GitHub link
+            # is kept, so memory stays flat however large the team is
+            # A failing Linear page raises out of the iterator and aborts the report (exit 1);
+            # queued GitHub lookups are cancelled so the error surfaces right away
+            try:
+                for issue_data in linear.iter_team_issues_streaming(team_id, page_size=200):
+                    issue_count += 1
+                    if issue_count % 200 == 0:
+                        print(f"Fetched {issue_count} issues so far...")
+
+                    # Only get the first GitHub link from attachments (mirrored issue)
+                    github_link = extract_first_attachment_github_link(issue_data)
+
+                    if github_link:
+                        issues_with_gh_links += 1
+                        linear_id = issue_data['identifier']
+                        linear_status = issue_data['state']['name']
+                        linear_title = issue_data['title']
+
+                        repo, issue_number, source = github_link
+                        linked_issues = linear_issues_by_link.get((repo, issue_number))
+                        if linked_issues is None:
+                            linked_issues = linear_issues_by_link[(repo, issue_number)] = []
+                            pending_batch.append((repo, issue_number))
+                            if len(pending_batch) >= batch_size:
+                                submit_batch(executor, pending_batch)
+                                pending_batch = []
+                        linked_issues.append((linear_id, linear_status, linear_title))
+
+                    # Check if we should stop due to --stop-after limit
+                    if args.stop_after and issue_count >= args.stop_after:
+                        print(f"DEBUG MODE: Stopped after fetching {issue_count} issues")
+                        break
+            except Exception:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+            if pending_batch:
+                submit_batch(executor, pending_batch)
+
+            print(f"Fetched {issue_count} issues in total")
+            print(f"Processing {issue_count} Linear issues...")
+            print("Extracting mirrored GitHub issues (first attachment link only)...")
+            print(f"Found {issues_with_gh_links} mirrored GitHub issues ({len(linear_issues_by_link)} unique) from {issues_with_gh_links} Linear issues")
+            print("Processing GitHub API requests in parallel...")
+
+            last_progress = time.monotonic()
+
+            # Process completed batches; results are only fanned out once all Linear
+            # issues are known, so late duplicates of an early link are not missed
+            for future in as_completed(future_to_batch):
                 try:
-                    table_row, status = future.result()
+                    batch_results = future.result()
+                except Exception as e:
+                    for repo, issue_number in future_to_batch[future]:
+                        for linear_id, linear_status, linear_title in linear_issues_by_link[(repo, issue_number)]:
+                            processed_count += 1
+                            error_reports.append(f"EXCEPTION: {linear_id} → {repo}#{issue_number} (Python error: {e})")
+                    continue
+
+                # Fan each fetched GitHub issue out to every Linear issue that mirrors it
+                results = [
+                    (linear_id, repo, issue_number,
+                     *process_github_link(github_details, fetch_status, linear_id, linear_status, linear_title, repo,
+                                          args.show_all))
+                    for (repo, issue_number), (github_details, fetch_status) in batch_results.items()
+                    for linear_id, linear_status, linear_title in linear_issues_by_link[(repo, issue_number)]
+                ]
+
+                for linear_id, repo, issue_number, table_row, status in results:
+                    processed_count += 1
 
                     if status == 'success' and table_row:
                         table_rows.append(table_row)
+                    elif status == 'filtered':
+                        filtered_count += 1
                     elif status == 'rate_limited':
                         rate_limit_hits += 1
                         error_reports.append(f"RATE LIMITED: {linear_id} → {repo}#{issue_number} (after retries)")
@@ -293,12 +377,11 @@ Configuration:
                     elif status == 'error':
                         error_reports.append(f"ERROR: {linear_id} → {repo}#{issue_number} (network/API error)")
 
-                except Exception as e:
-                    error_reports.append(f"EXCEPTION: {linear_id} → {repo}#{issue_number} (Python error: {e})")
-
-                # Print progress every 50 completed requests
-                if processed_count % 50 == 0:
-                    print(f"Processed {processed_count:3d}/{len(github_tasks)} GitHub links, found {len(table_rows):3d} valid, hit rate limit {rate_limit_hits:2d} times.")
+                # Print progress at most once per PROGRESS_INTERVAL, not per completed link
+                now = time.monotonic()
+                if now - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = now
+                    print(f"Processed {processed_count:3d}/{issues_with_gh_links} GitHub links, found {len(table_rows) + filtered_count:3d} valid, hit rate limit {rate_limit_hits:2d} times.")
 
         print(f"Completed processing {processed_count} GitHub links")
 
@@ -312,56 +395,30 @@ Configuration:
 
         # Phase 3: Filter and display the table
         # Sort by Linear ID with proper numeric ordering (MOCO-29 before MOCO-289)
-        def sort_key(row):
-            linear_id = row[0]  # e.g., "MOCO-123"
-            if '-' in linear_id:
-                prefix, number_str = linear_id.split('-', 1)
-                try:
-                    number = int(number_str)
-                    return (prefix, number)
-                except ValueError:
-                    # Fallback to string sorting if number parsing fails
-                    return (prefix, number_str)
-            else:
-                # Fallback for IDs without dashes
-                return (linear_id, 0)
-        
-        table_rows.sort(key=sort_key)
+        table_rows.sort(key=linear_id_sort_key)
         
-        # Apply filtering unless --show-all is specified
-        if not args.show_all:
-            original_count = len(table_rows)
-            filtered_rows = []
-            for row in table_rows:
-                linear_id, linear_status, linear_title, gh_number, gh_status, gh_title, repo = row
-                
-                # Check if this status pair should be filtered
-                status_pair = (linear_status.lower(), gh_status.lower())
-                if status_pair in FILTERED_STATUS_PAIRS:
-                    continue  # Skip this row as it's a matching/expected status combination
-                    
-                filtered_rows.append(row)
-            
-            table_rows = filtered_rows
-            filtered_count = original_count - len(table_rows)
-            if filtered_count > 0:
-                print(f"\nFiltered out {filtered_count} rows ({len(FILTERED_STATUS_PAIRS)} matching status pairs). Use --show-all to see all.")
+        # Matching status pairs were already dropped while processing, unless --show-all
+        if filtered_count > 0:
+            print(f"\nFiltered out {filtered_count} rows ({len(FILTERED_STATUS_PAIRS)} matching status pairs). Use --show-all to see all.")
 
         # Output results
         if args.markdown:
             # Save to markdown file
-            markdown_content = f"# Linear-GitHub Issue Status Report\n\n"
-            markdown_content += f"**Generated on:** {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            markdown_content += f"**Summary:**\n"
-            markdown_content += f"- Total Linear issues processed: {len(all_issues)}\n"
-            markdown_content += f"- Issues that had mirrored GitHub links: {issues_with_gh_links}\n"
-            markdown_content += f"- Issues with valid GitHub links: {len(table_rows)}\n\n"
+            markdown_parts = [
+                "# Linear-GitHub Issue Status Report\n\n",
+                f"**Generated on:** {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+                "**Summary:**\n",
+                f"- Total Linear issues processed: {issue_count}\n",
+                f"- Issues that had mirrored GitHub links: {issues_with_gh_links}\n",
+                f"- Issues with valid GitHub links: {len(table_rows)}\n\n",
+            ]
             
             if not args.show_all:
-                markdown_content += f"**Note:** Filtered out {original_count - len(table_rows) if 'original_count' in locals() else 0} matching status pairs. Use --show-all to include all.\n\n"
+                markdown_parts.append(f"**Note:** Filtered out {filtered_count} matching status pairs. Use --show-all to include all.\n\n")
             
-            markdown_content += f"## Results ({len(table_rows)} issues)\n\n"
-            markdown_content += create_markdown_table(table_rows)
+            markdown_parts.append(f"## Results ({len(table_rows)} issues)\n\n")
+            markdown_parts.append(create_markdown_table(table_rows))
+            markdown_content = "".join(markdown_parts)
             
             # Write to file
             with open(args.markdown, 'w', encoding='utf-8') as f:
@@ -372,14 +429,13 @@ Configuration:
         else:
             # Regular console output
             print(f"\nShowing {len(table_rows)} Linear issues with valid mirrored GitHub issues")
-            print_table_header()
-
-            for row in table_rows:
-                print_table_row(*row)
-
-            print_table_footer()
+            # Build the whole table and emit it with a single write
+            lines = [format_table_header()]
+            lines.extend(format_table_row(*row) for row in table_rows)
+            lines.append(TABLE_SEPARATOR)
+            sys.stdout.write("\n".join(lines) + "\n")
         
-        print(f"\nTotal Linear issues processed: {len(all_issues)}")
+        print(f"\nTotal Linear issues processed: {issue_count}")
         print(f"Issues that had GitHub links: {issues_with_gh_links}")
         print(f"Issues with valid GitHub links: {len(table_rows)}")
 
@@ -388,6 +444,11 @@ Configuration:
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        # Release pooled keep-alive connections and the cache database
+        close_session()
+        if cache:
+            cache.close()
 
 if __name__ == "__main__":
     exit(main())
\ No newline at end of file
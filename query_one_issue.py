@@ -8,12 +8,31 @@ import json
 import sys
 import time
 import argparse
+from bisect import bisect_right
+from itertools import accumulate
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 from urllib.parse import urlparse
-from github_access import GitHubAPI
-from env_config import load_env_file, check_tokens_tuple
+from github_access import GITHUB_NON_OWNER_PATHS, GitHubAPI
+from env_config import load_env_file, check_tokens
 from linear_access import LinearAPI
+from http_session import close_session
+
+# Optional linear-time regex engine for scanning long descriptions; stdlib re otherwise
+try:
+    import re2 as _link_re_engine
+except ImportError:
+    _link_re_engine = re
+
+# GitHub issue or pull request URL: captures "owner/repo" and the number
+_GH_LINK_RE = _link_re_engine.compile(r"github\.com/([A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+)/(?:issues|pull)/(\d+)\b")
+
+# Linear issue identifier: team key, dash, issue number (e.g. MOCO-1233)
+_IDENTIFIER_RE = re.compile(r"[A-Z][A-Z0-9]*-\d+")
+
+# Joins the texts scanned for links; the record separator never occurs in URLs
+_SEGMENT_SEPARATOR = "\x1e"
 
 @dataclass
 class Issue:
@@ -30,96 +49,72 @@ def extract_all_github_links_detailed(issue_data: dict) -> List[Tuple[str, int,
     """Extract all GitHub repository and issue numbers from Linear issue data with detailed source info
     Returns: List of (repo, issue_number, source_type, source_detail, matched_text) tuples
     """
-    github_patterns = [
-        r"github\.com/([^/]+/[^/]+)/issues/(\d+)",
-        r"github\.com/([^/]+/[^/]+)/pull/(\d+)",
-    ]
+    # Results are cached by the scanned texts themselves (a hashable tuple of strings),
+    # so the same issue content is only scanned once
+    attachments = tuple((attachment.get("url") or "", attachment.get("title") or "")
+                        for attachment in issue_data.get("attachments", {}).get("nodes", []))
+    issue_title = issue_data.get("title", "") or ""
+    description = issue_data.get("description", "") or ""
+    return list(_extract_links_cached(attachments, issue_title, description))
 
+@lru_cache(maxsize=512)
+def _extract_links_cached(attachments: Tuple[Tuple[str, str], ...], issue_title: str,
+                          description: str) -> Tuple[Tuple[str, int, str, str, str], ...]:
+    """Scan (url, title) attachment pairs, the issue title and the description for GitHub links"""
     found_links = []
     seen_links = set()  # Track (repo, number) pairs to avoid duplicates
 
-    # Check attachments
-    attachments = issue_data.get("attachments", {}).get("nodes", [])
-    for i, attachment in enumerate(attachments):
-        url = attachment.get("url", "")
-        title = attachment.get("title", "")
-
-        # Check attachment URL
-        for pattern in github_patterns:
-            match = re.search(pattern, url)
-            if match and len(match.groups()) == 2:
-                repo, number = match.groups()
-                link_key = (repo, int(number))
-                if link_key not in seen_links:
-                    seen_links.add(link_key)
-                    found_links.append((
-                        repo,
-                        int(number),
-                        "attachment_url",
-                        f"Attachment #{i+1}: '{title}'" if title else f"Attachment #{i+1}",
-                        match.group(0)
-                    ))
-
-        # Check attachment title
-        for pattern in github_patterns:
-            match = re.search(pattern, title)
-            if match and len(match.groups()) == 2:
-                repo, number = match.groups()
-                link_key = (repo, int(number))
-                if link_key not in seen_links:
-                    seen_links.add(link_key)
-                    found_links.append((
-                        repo,
-                        int(number),
-                        "attachment_title",
-                        f"Attachment #{i+1} title: '{title}'",
-                        match.group(0)
-                    ))
-
-    # Check issue title
-    issue_title = issue_data.get("title", "") or ""
-    for pattern in github_patterns:
-        match = re.search(pattern, issue_title)
-        if match and len(match.groups()) == 2:
-            repo, number = match.groups()
-            link_key = (repo, int(number))
-            if link_key not in seen_links:
-                seen_links.add(link_key)
-                found_links.append((
-                    repo,
-                    int(number),
-                    "issue_title",
-                    f"Linear issue title: '{issue_title}'",
-                    match.group(0)
-                ))
-
-    # Check description/body
-    description = issue_data.get("description", "") or ""
-    for pattern in github_patterns:
-        for match in re.finditer(pattern, description):
-            if len(match.groups()) == 2:
-                repo, number = match.groups()
-                link_key = (repo, int(number))
-                if link_key not in seen_links:
-                    seen_links.add(link_key)
-                    # Extract some context around the match
-                    start = max(0, match.start() - 30)
-                    end = min(len(description), match.end() + 30)
-                    context = description[start:end].replace('\n', ' ').strip()
-                    if start > 0:
-                        context = "..." + context
-                    if end < len(description):
-                        context = context + "..."
-
-                    found_links.append((
-                        repo,
-                        int(number),
-                        "description",
-                        f"In description: '{context}'",
-                        match.group(0)
-                    ))
-
-    return found_links
+    # Texts to scan in priority order as (source_type, text, attachment_index); the
+    # source detail is only formatted for links that survive deduplication
+    segments = []
+    for i, (url, title) in enumerate(attachments):
+        segments.append(("attachment_url", url, i))
+        segments.append(("attachment_title", title, i))
+    segments.append(("issue_title", issue_title, None))
+    segments.append(("description", description, None))
+
+    # Cheap substring test first: most texts contain no GitHub link at all
+    segments = [segment for segment in segments if "github.com/" in segment[1]]
+    if not segments:
+        return ()
+
+    # Scan everything with a single regex pass. The separator cannot occur in a
+    # matched repo path, so no match can span two texts; segment_starts maps a match
+    # back to the text it came from.
+    blob = _SEGMENT_SEPARATOR.join(text for _, text, _ in segments)
+    segment_starts = list(accumulate((len(text) + 1 for _, text, _ in segments[:-1]), initial=0))
+
+    for match in _GH_LINK_RE.finditer(blob):
+        link_key = (match.group(1), int(match.group(2)))
+        if link_key in seen_links or link_key[0].partition("/")[0] in GITHUB_NON_OWNER_PATHS:
+            continue
+        seen_links.add(link_key)
+
+        index = bisect_right(segment_starts, match.start()) - 1
+        source_type, text, attachment_index = segments[index]
+        if source_type == "attachment_url":
+            title = attachments[attachment_index][1]
+            source_detail = f"Attachment #{attachment_index+1}: '{title}'" if title else f"Attachment #{attachment_index+1}"
+        elif source_type == "attachment_title":
+            source_detail = f"Attachment #{attachment_index+1} title: '{text}'"
+        elif source_type == "issue_title":
+            source_detail = f"Linear issue title: '{text}'"
+        else:
+            # Extract some context around the match
+            match_start = match.start() - segment_starts[index]
+            match_end = match.end() - segment_starts[index]
+            start = max(0, match_start - 30)
+            end = min(len(text), match_end + 30)
+            context = text[start:end].replace('\n', ' ').strip()
+            if start > 0:
+                context = "..." + context
+            if end < len(text):
+                context = context + "..."
+            source_detail = f"In description: '{context}'"
+
+        found_links.append((*link_key, source_type, source_detail, match.group(0)))
+
+    return tuple(found_links)
 
 
 def main():
@@ -128,11 +123,18 @@ def main():
     parser.add_argument("issue_identifier", help="Linear issue identifier (e.g., MOCO-1233)")
     args = parser.parse_args()
 
+    # Team keys are uppercase and Linear matches them case-sensitively, so accept
+    # "moco-1233" but reject malformed identifiers before any API round-trips
+    identifier = args.issue_identifier.upper()
+    if not _IDENTIFIER_RE.fullmatch(identifier):
+        print(f"Error: Invalid issue identifier {args.issue_identifier!r} (expected TEAM-NUMBER, e.g. MOCO-1233)")
+        return 1
+
     # Load environment variables from .env file
     tokens = load_env_file()
 
     # Check if required tokens are present
-    if not check_tokens_tuple(tokens):
+    if not check_tokens(tokens):
         return 1
 
     # Initialize APIs
@@ -141,10 +143,10 @@ def main():
 
     try:
         # Get the Linear issue by identifier
-        issue_data = linear.get_issue_by_identifier(args.issue_identifier)
+        issue_data = linear.get_issue_by_identifier(identifier, fields="full")
 
         if not issue_data:
-            print(f"Error: Issue {args.issue_identifier} not found")
+            print(f"Error: Issue {identifier} not found")
             return 1
 
         # Extract GitHub links with detailed source information
@@ -157,6 +159,9 @@ def main():
         print()
 
         if github_links:
+            # Fetch all linked GitHub issues up front, in a single batched request with a token
+            github_results = github.get_issue_details_batch([(repo, number) for repo, number, *_ in github_links])
+
             print(f"Found {len(github_links)} GitHub link(s):")
             print("=" * 80)
 
@@ -168,7 +173,7 @@ def main():
                 print(f"   Matched text: '{matched_text}'")
 
                 # Get GitHub issue details
-                github_details, status = github.get_issue_details(repo, issue_number)
+                github_details, status = github_results[(repo, issue_number)]
                 if github_details and status == 'success':
                     print(f"   GitHub Status: {github_details['state']}")
                     print(f"   GitHub Title: {github_details['title']}")
@@ -190,6 +195,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        # Release pooled keep-alive connections
+        close_session()
 
 if __name__ == "__main__":
     exit(main())
\ No newline at end of file